@@ -1,71 +1,503 @@
 import sys
 import os
 import subprocess
+import re
+import shutil
+import queue
+import selectors
+import signal
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QObject, QSize
+from PyQt6.QtCore import (
+    Qt, QThread, pyqtSignal, QObject, QSize, QRunnable, QThreadPool,
+    QSemaphore, QMutex, QMutexLocker, QTimer, QDir, QStringListModel
+)
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QGroupBox, QLabel, QLineEdit, QPushButton, QFileDialog,
-    QListWidget, QCheckBox, QSpinBox, QProgressBar, QMessageBox,
-    QListWidgetItem, QStyleFactory, QComboBox, QTabWidget, QTextBrowser
+    QListView, QCheckBox, QSpinBox, QProgressBar, QMessageBox,
+    QStyleFactory, QComboBox, QTabWidget, QPlainTextEdit,
+    QCompleter
 )
-from PyQt6.QtGui import QFont, QColor, QPalette
+from PyQt6.QtGui import QFont, QColor, QPalette, QFileSystemModel
+
+try:
+    from wand.image import Image as WandImage
+    from wand.exceptions import WandException
+except ImportError:
+    # Wand is optional; it also raises ImportError when ImageMagick is missing.
+    WandImage = None
+
+LOG_DRAIN_INTERVAL_MS = 50
+
+class LogBuffer:
+    """Thread-safe queue of log text, drained in bulk by the GUI thread."""
+
+    def __init__(self):
+        self._lock = QMutex()
+        self._parts = deque()
+
+    def write(self, text):
+        with QMutexLocker(self._lock):
+            self._parts.append(text)
+
+    def take(self):
+        with QMutexLocker(self._lock):
+            parts, self._parts = self._parts, deque()
+        return parts
+
+def wait_process(process, timeout=None):
+    """Wait for a child to exit, using a pidfd where the platform has one.
+
+    A pidfd becomes readable when the child exits, so a timed wait sleeps in
+    select() instead of the stdlib's waitpid polling loop.
+    """
+    if process.returncode is None and hasattr(os, "pidfd_open"):
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except OSError:
+            pidfd = None
+        if pidfd is not None:
+            try:
+                with selectors.DefaultSelector() as selector:
+                    selector.register(pidfd, selectors.EVENT_READ)
+                    ready = selector.select(timeout)
+            finally:
+                os.close(pidfd)
+            if not ready:
+                raise subprocess.TimeoutExpired(process.args, timeout)
+    return process.wait(timeout)
+
+def signal_process_group(process, kill=False):
+    """Terminate (or kill) a child started in its own session, helpers included."""
+    if process.poll() is not None:
+        return
+    if os.name == "posix":
+        try:
+            os.killpg(process.pid, signal.SIGKILL if kill else signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    elif kill:
+        process.kill()
+    else:
+        process.terminate()
+
+KILL_GRACE_MS = 2000
+
+GM_BATCH_ARGS = [
+    "gm", "batch", "-escape", "unix", "-echo", "off", "-feedback", "on", "-prompt", "off", "-"
+]
+BATCH_UNSAFE_CHARS = re.compile(r"([^\w@%+=:,./-])")
+
+def batch_quote(arg):
+    # Backslash-escape rather than quote: with `-escape unix` a backslash
+    # always escapes the next character, so apostrophes, spaces and Windows
+    # path separators survive without relying on quote concatenation.
+    return BATCH_UNSAFE_CHARS.sub(r"\\\1", arg)
+
+class GMBatchSession:
+    """A long-lived `gm batch` process that runs one command line at a time."""
 
-class EnhancedConvertWorker(QObject):
-    progress_incremented = pyqtSignal()
-    output_received = pyqtSignal(str)
-    finished = pyqtSignal(bool, str)
-    current_file = pyqtSignal(str)
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            GM_BATCH_ARGS,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            start_new_session=True
+        )
 
-    def __init__(self, commands, output_dir):
+    def run(self, cmd_parts, output):
+        # Drop the leading "gm"; -feedback prints PASS/FAIL after each command.
+        self.proc.stdin.write(" ".join(batch_quote(p) for p in cmd_parts[1:]) + "\n")
+        self.proc.stdin.flush()
+        for line in self.proc.stdout:
+            status = line.strip()
+            if status in ("PASS", "FAIL"):
+                return status == "PASS"
+            output.write(line)
+        raise OSError("gm batch exited unexpectedly")
+
+    def close(self):
+        try:
+            self.proc.stdin.close()
+            wait_process(self.proc, timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+            wait_process(self.proc)
+
+def convert_with_wand(cmd_parts):
+    """Apply a `gm convert` command from build_commands in-process via Wand."""
+    options = {}
+    args = iter(cmd_parts[3:-1])
+    for opt in args:
+        options[opt] = None if opt in ("-flip", "-flop") else next(args)
+
+    with WandImage(filename=cmd_parts[2]) as img:
+        if "-resize" in options:
+            # Same semantics as gm: fit inside WxH, keeping the aspect ratio.
+            width, height = (int(v) for v in options["-resize"].split("x"))
+            scale = min(width / img.width, height / img.height)
+            img.resize(
+                max(1, round(img.width * scale)),
+                max(1, round(img.height * scale)),
+                filter=options.get("-filter", "undefined").lower()
+            )
+        if "-unsharp" in options:
+            geometry, amount, threshold = options["-unsharp"].split("+")
+            radius, sigma = geometry.split("x")
+            img.unsharp_mask(radius=float(radius), sigma=float(sigma),
+                             amount=float(amount), threshold=float(threshold))
+        if "-rotate" in options:
+            img.rotate(float(options["-rotate"]))
+        if "-flip" in options:
+            img.flip()
+        if "-flop" in options:
+            img.flop()
+        if "-quality" in options:
+            img.compression_quality = int(options["-quality"])
+        if "-profile" in options:
+            with open(options["-profile"], "rb") as f:
+                img.profiles["icc"] = f.read()
+        img.save(filename=cmd_parts[-1])
+
+def file_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+class ConvertTask(QRunnable):
+    def __init__(self, worker, idx, cmd_parts):
+        super().__init__()
+        self.worker = worker
+        self.idx = idx
+        self.cmd_parts = cmd_parts
+
+    def run(self):
+        worker = self.worker
+        try:
+            if not worker._is_running:
+                return
+            total = len(worker.commands)
+            worker.current_file = self.cmd_parts[-1]
+            output = worker.log
+            if worker.verbose:
+                output.write(f"[{self.idx+1}/{total}] Executing: {' '.join(self.cmd_parts)}\n")
+            else:
+                output.write(f"[{self.idx+1}/{total}] {self.cmd_parts[-1]}\n")
+
+            output_mtime = file_mtime(self.cmd_parts[-1])
+            try:
+                ok = self.execute(output)
+            except Exception as e:
+                output.write(f"Critical Error: {e}\n")
+                worker.fail(str(e))
+                return
+
+            if ok is None:
+                # gm was killed mid-write; don't leave a truncated file behind.
+                if file_mtime(self.cmd_parts[-1]) not in (None, output_mtime):
+                    try:
+                        os.remove(self.cmd_parts[-1])
+                    except OSError:
+                        pass
+                return
+            if not ok:
+                output.write(f"Error: gm failed on {self.cmd_parts[2]}\n")
+                worker.fail(f"Failed to process {self.cmd_parts[-1]}")
+                return
+            worker.task_done()
+        finally:
+            worker._slots.release()
+
+    def execute(self, output):
+        """Run the command, streaming its output; returns None if canceled."""
+        if self.worker.use_wand:
+            try:
+                convert_with_wand(self.cmd_parts)
+            except (WandException, OSError) as e:
+                output.write(f"{e}\n")
+                return False
+            return True
+
+        session = self.worker.acquire_session()
+        if session is not None:
+            if not self.worker._is_running:
+                # stop() ran while the session was being handed out.
+                self.worker.release_session(session)
+                return None
+            try:
+                ok = session.run(self.cmd_parts, output)
+            except OSError as e:
+                if not self.worker._is_running:
+                    return None  # Killed by stop()
+                self.worker.disable_batch(session, e)
+            else:
+                self.worker.release_session(session)
+                return ok
+
+        process = subprocess.Popen(
+            self.cmd_parts,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            start_new_session=True
+        )
+        self.worker.track_process(process)
+        try:
+            with process:
+                if not self.worker._is_running:
+                    # stop() ran before the child was tracked and missed it.
+                    signal_process_group(process)
+                    wait_process(process)
+                    return None
+                for line in process.stdout:
+                    if not self.worker._is_running:
+                        signal_process_group(process)
+                        break
+                    output.write(line)
+                returncode = wait_process(process)
+        finally:
+            self.worker.untrack_process(process)
+        if not self.worker._is_running and returncode != 0:
+            return None
+        return returncode == 0
+
+class GMVersionProbe(QRunnable):
+    """Runs `gm version` off the GUI thread and reports its output."""
+
+    class Signals(QObject):
+        finished = pyqtSignal(str)
+
+    def __init__(self, gm_path):
+        super().__init__()
+        self.gm_path = gm_path
+        self.signals = self.Signals()
+
+    def run(self):
+        try:
+            result = subprocess.run([self.gm_path, "version"], capture_output=True, text=True)
+            output = result.stdout
+        except OSError:
+            output = ""
+        try:
+            self.signals.finished.emit(output)
+        except RuntimeError:
+            pass  # The window was closed before gm answered
+
+
+class ConvertThread(QThread):
+    def __init__(self, commands, settings):
         super().__init__()
         self.commands = commands
-        self.output_dir = output_dir
+        self.max_workers = QThread.idealThreadCount() if settings.parallel else 1
+        self.verbose = settings.verbose
+        self.use_wand = settings.use_wand
+        self.log = LogBuffer()
+        self.completed = 0
+        self.current_file = ""
+        self.success = True
+        self.error_msg = ""
+        self.canceled = False
         self._is_running = True
+        self._lock = QMutex()
+        self._slots = QSemaphore(self.max_workers)
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(self.max_workers)
+        self._use_batch = True
+        self._idle_sessions = queue.SimpleQueue()
+        self._sessions = []
+        self._processes = set()
 
     def run(self):
-        success = True
-        error_msg = ""
+        # Tasks run on the pool; this thread only submits them and waits.
+        # The GUI polls log, completed and current_file on a timer.
         try:
-            Path(self.output_dir).mkdir(parents=True, exist_ok=True)
-            total = len(self.commands)
             for idx, cmd_parts in enumerate(self.commands):
+                self._slots.acquire()
                 if not self._is_running:
+                    self._slots.release()
                     break
-                self.current_file.emit(cmd_parts[-1])
-                self.output_received.emit(f"[{idx+1}/{total}] Executing: {' '.join(cmd_parts)}\n")
-
-                try:
-                    process = subprocess.run(
-                        cmd_parts,
-                        check=True,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True
-                    )
-                    self.output_received.emit(process.stdout)
-                except subprocess.CalledProcessError as e:
-                    self.output_received.emit(f"Error: {e.output}")
-                    success = False
-                    error_msg = f"Failed to process {cmd_parts[-1]}"
-                    break
-
-                self.progress_incremented.emit()
+                self._pool.start(ConvertTask(self, idx, cmd_parts))
         except Exception as e:
-            error_msg = str(e)
-            success = False
-            self.output_received.emit(f"Critical Error: {error_msg}")
+            self.log.write(f"Critical Error: {e}\n")
+            self.fail(str(e))
         finally:
-            self.finished.emit(success, error_msg)
+            self._pool.waitForDone()
+            for session in self._sessions:
+                session.close()
+
+    def acquire_session(self):
+        # One `gm batch` process per pool thread, created on first use.
+        if not self._use_batch:
+            return None
+        try:
+            return self._idle_sessions.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            session = GMBatchSession()
+        except OSError:
+            self._use_batch = False
+            return None
+        with QMutexLocker(self._lock):
+            self._sessions.append(session)
+        if not self._is_running:
+            signal_process_group(session.proc)  # Missed by a concurrent stop()
+        return session
+
+    def release_session(self, session):
+        self._idle_sessions.put(session)
+
+    def disable_batch(self, session, error):
+        # Older gm builds lack `batch`; fall back to one process per file.
+        with QMutexLocker(self._lock):
+            notify = self._use_batch
+            self._use_batch = False
+        if notify:
+            self.log.write(f"gm batch unavailable, using per-file gm convert ({error})\n")
+        session.close()
+
+    def task_done(self):
+        with QMutexLocker(self._lock):
+            self.completed += 1
+
+    def fail(self, error_msg):
+        # Keep the first failure and stop submitting further commands.
+        with QMutexLocker(self._lock):
+            if self.success:
+                self.success = False
+                self.error_msg = error_msg
+            self._is_running = False
+
+    def track_process(self, process):
+        with QMutexLocker(self._lock):
+            self._processes.add(process)
+
+    def untrack_process(self, process):
+        with QMutexLocker(self._lock):
+            self._processes.discard(process)
 
     def stop(self):
+        # Called on the GUI thread: preempt running gm children instead of
+        # letting them finish, and kill any that ignore SIGTERM.
+        self.canceled = True
         self._is_running = False
+        with QMutexLocker(self._lock):
+            processes = list(self._processes)
+            processes += [session.proc for session in self._sessions]
+        for process in processes:
+            signal_process_group(process)
+        if processes:
+            QTimer.singleShot(KILL_GRACE_MS, lambda: [
+                signal_process_group(process, kill=True) for process in processes
+            ])
+
+@dataclass(frozen=True, slots=True)
+class ConvSettings:
+    """Snapshot of the conversion widgets, taken once per run."""
+    fmt: str | None
+    quality: int
+    width: int
+    height: int
+    resize: bool
+    aspect: bool
+    rotate: str
+    flip: bool
+    flop: bool
+    profile: bool
+    preserve: bool
+    out_dir: str
+    parallel: bool = False
+    verbose: bool = False
+    use_wand: bool = False
+
+def build_commands(files, settings):
+    commands = []
+    output_root = Path(settings.out_dir)
+
+    # Everything between the input and output paths is the same for
+    # every file, so build it once.
+    options = []
+    if settings.resize:
+        options += ["-resize", f"{settings.width}x{settings.height}"]
+        if settings.aspect:
+            options += ["-filter", "Lanczos", "-unsharp", "0.25x0.25+8+0.065"]
+
+    if settings.rotate != "0":
+        options += ["-rotate", settings.rotate]
+
+    if settings.flip:
+        options += ["-flip"]
+    if settings.flop:
+        options += ["-flop"]
+
+    # Add quality if format supports it
+    if settings.fmt in ('jpg', 'webp', 'tiff'):
+        options += ["-quality", str(settings.quality)]
+
+    if settings.profile:
+        options += ["-profile", "RGB.icm"]
+    options = tuple(options)
+
+    output_dirs = {}  # input directory -> mirrored output directory
+    for input_file in files:
+        input_path = Path(input_file)
+        output_path = output_root
+
+        if settings.preserve:
+            parent = os.path.dirname(input_file)
+            output_path = output_dirs.get(parent)
+            if output_path is None:
+                output_path = output_root / input_path.parent.relative_to(input_path.anchor)
+                output_dirs[parent] = output_path
+
+        if settings.fmt:
+            output_file = output_path / f"{input_path.stem}.{settings.fmt}"
+        else:
+            output_file = output_path / f"{input_path.name}"
+
+        commands.append(["gm", "convert", str(input_path), *options, str(output_file)])
+
+    # Create each output directory exactly once, shallowest first, so
+    # deeper makedirs calls find their parents already in place.
+    target_dirs = {str(d) for d in output_dirs.values()} if settings.preserve else {str(output_root)}
+    for directory in sorted(target_dirs, key=len):
+        os.makedirs(directory, exist_ok=True)
+
+    if settings.parallel:
+        # Largest inputs first, so the pool does not end waiting on one big file.
+        sizes = {}
+        for cmd in commands:
+            try:
+                sizes[cmd[2]] = os.path.getsize(cmd[2])
+            except OSError:
+                sizes[cmd[2]] = 0
+        commands.sort(key=lambda cmd: sizes[cmd[2]], reverse=True)
+
+    return commands
+
+class FileListModel(QStringListModel):
+    """String list model that also serves each path as its tooltip."""
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.ToolTipRole:
+            role = Qt.ItemDataRole.DisplayRole
+        return super().data(index, role)
 
 class ImprovedGMConvertGUI(QMainWindow):
+    VALID_EXTS = frozenset({'.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp'})
+
     def __init__(self):
         super().__init__()
-        self.worker = None
         self.thread = None
+        self.input_files = []
+        self._last_ok_dir = None
         self.initUI()
         self.check_gm_installed()
         self.set_dark_theme()
@@ -108,10 +540,13 @@ class ImprovedGMConvertGUI(QMainWindow):
         file_group = QGroupBox("Input Files")
         file_layout = QVBoxLayout()
 
-        self.file_list = QListWidget()
-        self.file_list.setDragDropMode(QListWidget.DragDropMode.DropOnly)
-        self.file_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
-        self.file_list.setStyleSheet("QListWidget { background-color: #252525; }")
+        self.file_list = QListView()
+        self._file_model = FileListModel(self)
+        self.file_list.setModel(self._file_model)
+        self.file_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.file_list.setDragDropMode(QListView.DragDropMode.DropOnly)
+        self.file_list.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.file_list.setStyleSheet("QListView { background-color: #252525; }")
 
         btn_layout = QHBoxLayout()
         self.btn_add_files = QPushButton("Add Files")
@@ -131,6 +566,16 @@ class ImprovedGMConvertGUI(QMainWindow):
         output_layout = QVBoxLayout()
 
         self.output_dir = QLineEdit()
+        self._fs_model = QFileSystemModel(self)
+        self._fs_model.setFilter(QDir.Filter.AllDirs | QDir.Filter.NoDotAndDotDot | QDir.Filter.Drives)
+        self._fs_model.setRootPath("")
+        self.output_dir.setCompleter(QCompleter(self._fs_model, self))
+        # Check the typed path once typing pauses, not on every keystroke.
+        self._output_dir_timer = QTimer(self)
+        self._output_dir_timer.setSingleShot(True)
+        self._output_dir_timer.setInterval(200)
+        self._output_dir_timer.timeout.connect(self.revalidate_output_dir)
+        self.output_dir.textChanged.connect(self._output_dir_timer.start)
         self.btn_output_dir = QPushButton("Select Output Directory")
         self.btn_output_dir.clicked.connect(self.browse_output_dir)
 
@@ -196,8 +641,12 @@ class ImprovedGMConvertGUI(QMainWindow):
         param_group.setLayout(param_layout)
 
         # Progress and Logs
-        self.log_browser = QTextBrowser()
-        #self.log_browser.setMaximumBlockCount(1000)  # Limit log memory usage
+        self.log_browser = QPlainTextEdit()
+        self.log_browser.setReadOnly(True)
+        self.log_browser.setMaximumBlockCount(1000)  # Limit log memory usage
+        self.log_timer = QTimer(self)
+        self.log_timer.setInterval(LOG_DRAIN_INTERVAL_MS)
+        self.log_timer.timeout.connect(self.poll_conversion)
         self.progress_bar = QProgressBar()
         self.progress_bar.setRange(0, 0)  # Indeterminate by default
 
@@ -238,6 +687,18 @@ class ImprovedGMConvertGUI(QMainWindow):
         self.chk_parallel = QCheckBox("Parallel processing (experimental)")
         self.chk_color_profile = QCheckBox("Preserve color profiles")
 
+        backend_layout = QHBoxLayout()
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItems(["gm CLI", "MagickWand (in-process)"])
+        if WandImage is None:
+            wand_item = self.backend_combo.model().item(1)
+            wand_item.setEnabled(False)
+            wand_item.setToolTip("Install Wand and ImageMagick to enable")
+        backend_layout.addWidget(QLabel("Backend:"))
+        backend_layout.addWidget(self.backend_combo)
+        backend_layout.addStretch()
+
+        advanced_layout.addLayout(backend_layout)
         advanced_layout.addWidget(self.chk_verbose)
         advanced_layout.addWidget(self.chk_parallel)
         advanced_layout.addWidget(self.chk_color_profile)
@@ -254,10 +715,33 @@ class ImprovedGMConvertGUI(QMainWindow):
             event.acceptProposedAction()
 
     def dropEvent(self, event):
-        files = [url.toLocalFile() for url in event.mimeData().urls()]
-        valid_extensions = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp')
-        self.input_files = [f for f in files if f.lower().endswith(valid_extensions)]
-        self.update_file_list()
+        files = []
+        for url in event.mimeData().urls():
+            path = url.toLocalFile()
+            # Only paths that don't look like images cost a stat.
+            if os.path.splitext(path)[1].lower() in self.VALID_EXTS:
+                files.append(path)
+            elif os.path.isdir(path):
+                files.extend(self.scan_images(path))
+        self.add_files(files)
+
+    def scan_images(self, directory):
+        # scandir entries carry the file type from readdir, so no per-file stat.
+        images = []
+        pending = [directory]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif (entry.is_file(follow_symlinks=False)
+                          and os.path.splitext(entry.name)[1].lower() in self.VALID_EXTS):
+                        images.append(entry.path)
+        return images
 
     def browse_files(self):
         files, _ = QFileDialog.getOpenFileNames(
@@ -265,20 +749,20 @@ class ImprovedGMConvertGUI(QMainWindow):
             "Images (*.png *.jpg *.jpeg *.bmp *.tiff *.webp)"
         )
         if files:
-            self.input_files = files
-            self.update_file_list()
+            self.add_files(files)
+
+    def add_files(self, files):
+        queued = set(self.input_files)
+        self.input_files += [f for f in dict.fromkeys(files) if f not in queued]
+        self.update_file_list()
 
     def update_file_list(self):
-        self.file_list.clear()
-        for f in self.input_files:
-            item = QListWidgetItem(f)
-            item.setToolTip(f)
-            self.file_list.addItem(item)
+        self._file_model.setStringList(self.input_files)
         self.file_counter.setText(f"{len(self.input_files)} files queued")
 
     def clear_files(self):
         self.input_files = []
-        self.file_list.clear()
+        self._file_model.setStringList([])
         self.file_counter.setText("0 files queued")
 
     def browse_output_dir(self):
@@ -286,115 +770,117 @@ class ImprovedGMConvertGUI(QMainWindow):
         if directory:
             self.output_dir.setText(directory)
 
-    def validate_settings(self):
+    def revalidate_output_dir(self):
+        directory = self.output_dir.text()
+        if not directory or (os.path.isdir(directory) and os.access(directory, os.W_OK)):
+            self.output_dir.setStyleSheet("")
+            self.output_dir.setToolTip("")
+        else:
+            self.output_dir.setStyleSheet("QLineEdit { border: 1px solid #c0392b; }")
+            self.output_dir.setToolTip("Output directory does not exist or is not writable")
+
+    def conversion_settings(self):
+        output_format = self.format_combo.currentText().lower()
+        return ConvSettings(
+            fmt=None if output_format == "same as input" else output_format,
+            quality=self.quality_spin.value(),
+            width=self.width_spin.value(),
+            height=self.height_spin.value(),
+            resize=self.resize_check.isChecked(),
+            aspect=self.aspect_check.isChecked(),
+            rotate=self.rotate_combo.currentText().rstrip('°'),
+            flip=self.flip_check.isChecked(),
+            flop=self.flop_check.isChecked(),
+            profile=self.chk_color_profile.isChecked(),
+            preserve=self.chk_preserve_structure.isChecked(),
+            out_dir=self.output_dir.text(),
+            parallel=self.chk_parallel.isChecked(),
+            verbose=self.chk_verbose.isChecked(),
+            use_wand=self.backend_combo.currentIndex() == 1
+        )
+
+    def validate_settings(self, settings):
         if not self.input_files:
             QMessageBox.warning(self, "Warning", "Please select input files!")
             return False
-        if not self.output_dir.text():
+        if not settings.out_dir:
             QMessageBox.warning(self, "Warning", "Please select output directory!")
             return False
         try:
-            if not os.access(self.output_dir.text(), os.W_OK):
+            # Skip the access check (a network round-trip on SMB/NFS) while
+            # the directory's identity and permissions are unchanged since it
+            # last passed. Writing converted files into it touches none of these.
+            try:
+                st = os.stat(settings.out_dir)
+                checked = (settings.out_dir, st.st_dev, st.st_ino, st.st_mode, st.st_uid, st.st_gid)
+            except OSError:
+                checked = None
+            if checked is not None and checked == self._last_ok_dir:
+                return True
+            if checked is None or not os.access(settings.out_dir, os.W_OK):
                 raise PermissionError("Output directory is not writable")
+            self._last_ok_dir = checked
             return True
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
             return False
 
-    def build_commands(self):
-        commands = []
-        output_format = self.format_combo.currentText().lower()
-        if output_format == "same as input":
-            output_format = None
-
-        for input_path in self.input_files:
-            input_path = Path(input_path)
-            output_path = Path(self.output_dir.text())
-
-            if self.chk_preserve_structure.isChecked():
-                output_path = output_path / input_path.parent.relative_to(input_path.anchor)
-
-            output_path.mkdir(parents=True, exist_ok=True)
-
-            if output_format:
-                output_file = output_path / f"{input_path.stem}.{output_format}"
-            else:
-                output_file = output_path / f"{input_path.name}"
-
-            cmd = ["gm", "convert", str(input_path)]
-
-            # Add transformation parameters
-            if self.resize_check.isChecked():
-                cmd += ["-resize", f"{self.width_spin.value()}x{self.height_spin.value()}"]
-                if self.aspect_check.isChecked():
-                    cmd += ["-filter", "Lanczos", "-unsharp", "0.25x0.25+8+0.065"]
-
-            rotation = self.rotate_combo.currentText().rstrip('°')
-            if rotation != "0":
-                cmd += ["-rotate", rotation]
-
-            if self.flip_check.isChecked():
-                cmd += ["-flip"]
-            if self.flop_check.isChecked():
-                cmd += ["-flop"]
-
-            # Add quality if format supports it
-            if output_format in ('jpg', 'webp', 'tiff'):
-                cmd += ["-quality", str(self.quality_spin.value())]
-
-            if self.chk_color_profile.isChecked():
-                cmd += ["-profile", "RGB.icm"]
-
-            cmd.append(str(output_file))
-            commands.append(cmd)
-
-        return commands
-
     def start_conversion(self):
-        if not self.validate_settings():
+        settings = self.conversion_settings()
+        if not self.validate_settings(settings):
             return
 
-        commands = self.build_commands()
+        commands = build_commands(self.input_files, settings)
         self.log_browser.clear()
         self.btn_convert.setEnabled(False)
         self.btn_cancel.setEnabled(True)
         self.progress_bar.setRange(0, len(commands))
         self.progress_bar.setValue(0)
 
-        self.thread = QThread()
-        self.worker = EnhancedConvertWorker(commands, self.output_dir.text())
-        self.worker.moveToThread(self.thread)
-
-        self.thread.started.connect(self.worker.run)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.worker.progress_incremented.connect(lambda: self.progress_bar.setValue(self.progress_bar.value() + 1))
-        self.worker.output_received.connect(self.update_log)
-        self.worker.finished.connect(self.conversion_finished)
-        self.worker.current_file.connect(lambda f: self.status_label.setText(f"Processing: {f}"))
-
+        self.thread = ConvertThread(commands, settings)
+        self.thread.finished.connect(self.thread_finished)
+        self.log_timer.start()
         self.thread.start()
 
     def cancel_conversion(self):
-        if self.worker:
-            self.worker.stop()
+        if self.thread:
+            self.thread.stop()
         self.btn_cancel.setEnabled(False)
         self.status_label.setText("Conversion canceled")
         self.progress_bar.setRange(0, 1)
         self.progress_bar.setValue(0)
 
+    def poll_conversion(self):
+        if not self.thread:
+            return
+        parts = self.thread.log.take()
+        if parts:
+            self.update_log("".join(parts))
+        # Once canceled the progress widgets are reset; stop touching them.
+        if self.btn_cancel.isEnabled():
+            self.progress_bar.setValue(self.thread.completed)
+            if self.thread.current_file:
+                self.status_label.setText(f"Processing: {self.thread.current_file}")
+
+    def thread_finished(self):
+        self.log_timer.stop()
+        self.poll_conversion()
+        thread, self.thread = self.thread, None
+        thread.deleteLater()
+        self.conversion_finished(thread.success, thread.error_msg, thread.canceled)
+
     def update_log(self, text):
-        self.log_browser.append(text)
-        self.log_browser.ensureCursorVisible()
+        self.log_browser.appendPlainText(text.rstrip("\n"))
 
-    def conversion_finished(self, success, error_msg):
+    def conversion_finished(self, success, error_msg, canceled=False):
         self.btn_convert.setEnabled(True)
         self.btn_cancel.setEnabled(False)
         self.progress_bar.setRange(0, 1)
-        self.progress_bar.setValue(1 if success else 0)
+        self.progress_bar.setValue(1 if success and not canceled else 0)
 
-        if success:
+        if canceled:
+            self.status_label.setText("Conversion canceled")
+        elif success:
             QMessageBox.information(self, "Success", "All conversions completed successfully!")
             self.status_label.setText("Ready")
         else:
@@ -402,18 +888,40 @@ class ImprovedGMConvertGUI(QMainWindow):
             self.status_label.setText("Conversion failed")
 
     def check_gm_installed(self):
-        try:
-            result = subprocess.run(["gm", "version"], capture_output=True, text=True)
-            if "GraphicsMagick" not in result.stdout:
-                raise FileNotFoundError
-            self.log_browser.append("GraphicsMagick version detected:\n" + result.stdout)
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error",
-                "GraphicsMagick (gm) not found! Please install it and ensure it's in your PATH."
+        # which() only scans PATH; the `gm version` fork happens on the pool.
+        self._gm_path = shutil.which("gm")
+        if self._gm_path is None:
+            self.gm_not_found()
+            return
+        probe = GMVersionProbe(self._gm_path)
+        self._gm_probe_signals = probe.signals
+        probe.signals.finished.connect(self.gm_version_detected)
+        QThreadPool.globalInstance().start(probe)
+
+    def gm_version_detected(self, output):
+        self._gm_probe_signals = None
+        if "GraphicsMagick" not in output:
+            self.gm_not_found()
+            return
+        self.log_browser.appendPlainText("GraphicsMagick version detected:\n" + output)
+
+    def gm_not_found(self):
+        if WandImage is not None:
+            # The in-process backend needs no gm; make it the only choice.
+            self.backend_combo.setCurrentIndex(1)
+            gm_item = self.backend_combo.model().item(0)
+            gm_item.setEnabled(False)
+            gm_item.setToolTip("GraphicsMagick (gm) was not found in PATH")
+            self.log_browser.appendPlainText(
+                "GraphicsMagick (gm) not found; using the MagickWand backend."
             )
-            self.btn_convert.setEnabled(False)
+            return
+        QMessageBox.critical(
+            self,
+            "Error",
+            "GraphicsMagick (gm) not found! Please install it and ensure it's in your PATH."
+        )
+        self.btn_convert.setEnabled(False)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)